@@ -1,25 +1,84 @@
-import random
-from typing import List, Tuple, Optional
-from enum import Enum
-from collections import deque
+from typing import List, Tuple, Optional, NamedTuple, Union
+from enum import IntEnum
 
+import numpy as np
 
-class CellState(Enum):
-    """Enumeration for cell states in the game"""
-    HIDDEN = "hidden"
-    REVEALED = "revealed"
-    FLAGGED = "flagged"
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - numba is optional
+    HAS_NUMBA = False
 
 
-class Cell:
-    """Represents a single cell in the Minesweeper board"""
+class CellState(IntEnum):
+    """Enumeration for cell states in the game. Values are the codes stored in Board.state"""
+    HIDDEN = 0
+    REVEALED = 1
+    FLAGGED = 2
     
-    def __init__(self, row: int, col: int):
-        self.row = row
-        self.col = col
-        self.is_mine = False
-        self.state = CellState.HIDDEN
-        self.adjacent_mines = 0
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+# Plain int codes for array comparisons and Numba kernels
+HIDDEN = int(CellState.HIDDEN)
+REVEALED = int(CellState.REVEALED)
+FLAGGED = int(CellState.FLAGGED)
+
+_CELL_STATES = (CellState.HIDDEN, CellState.REVEALED, CellState.FLAGGED)
+
+# (row, col) offsets of the eight neighbours of a cell
+NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1),
+                    (0, -1),           (0, 1),
+                    (1, -1),  (1, 0),  (1, 1))
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _bfs_reveal(state, adjacent, observation, start_row, start_col, rows, cols):
+        """Flood-fill reveal from a zero cell. Returns the number of newly revealed cells"""
+        queue = np.empty(rows * cols, dtype=np.int32)
+        visited = np.zeros((rows, cols), dtype=np.bool_)
+        queue[0] = start_row * cols + start_col
+        head = 0
+        tail = 1
+        revealed = 0
+        
+        while head < tail:
+            row = queue[head] // cols
+            col = queue[head] % cols
+            head += 1
+            
+            if visited[row, col]:
+                continue
+            visited[row, col] = True
+            
+            for dr in range(-1, 2):
+                for dc in range(-1, 2):
+                    if dr == 0 and dc == 0:
+                        continue
+                    adj_row = row + dr
+                    adj_col = col + dc
+                    if adj_row < 0 or adj_row >= rows or adj_col < 0 or adj_col >= cols:
+                        continue
+                    if state[adj_row, adj_col] == HIDDEN:
+                        state[adj_row, adj_col] = REVEALED
+                        observation[adj_row, adj_col] = adjacent[adj_row, adj_col]
+                        revealed += 1
+                        if adjacent[adj_row, adj_col] == 0:
+                            queue[tail] = adj_row * cols + adj_col
+                            tail += 1
+        
+        return revealed
+
+
+class Cell(NamedTuple):
+    """Read-only view of a single cell, built on demand from the Board arrays"""
+    row: int
+    col: int
+    is_mine: bool
+    state: CellState
+    adjacent_mines: int
     
     def __str__(self) -> str:
         if self.state == CellState.HIDDEN:
@@ -32,83 +91,81 @@ class Cell:
             return " "
         else:
             return str(self.adjacent_mines)
-    
-    def reveal(self) -> bool:
-        """Reveal the cell. Returns True if it's a mine (game over)"""
-        if self.state == CellState.FLAGGED:
-            return False
-        
-        self.state = CellState.REVEALED
-        return self.is_mine
-    
-    def toggle_flag(self) -> bool:
-        """Toggle flag state. Returns True if flagged, False if unflagged"""
-        if self.state == CellState.REVEALED:
-            return False
-        
-        if self.state == CellState.HIDDEN:
-            self.state = CellState.FLAGGED
-            return True
-        else:
-            self.state = CellState.HIDDEN
-            return False
 
 
 class Board:
-    """Represents the Minesweeper game board"""
+    """Represents the Minesweeper game board
+    
+    Cells are stored as three parallel (rows x cols) arrays:
+    - is_mine: whether the cell holds a mine
+    - state: HIDDEN, REVEALED or FLAGGED
+    - adjacent: number of adjacent mines
+    
+    It also maintains the agent-visible observation incrementally: -2 for
+    flagged, -1 for hidden and the adjacent mine count for revealed cells.
+    """
     
-    def __init__(self, rows: int, cols: int, num_mines: int):
+    def __init__(self, rows: int, cols: int, num_mines: int,
+                 seed: Optional[Union[int, np.random.Generator]] = None):
         self.rows = rows
         self.cols = cols
         self.num_mines = num_mines
-        self.board = [[Cell(row, col) for col in range(cols)] for row in range(rows)]
+        # A Generator passed as seed is used as-is, so it can be shared with an agent
+        self.rng = np.random.default_rng(seed)
+        self.is_mine = np.zeros((rows, cols), dtype=bool)
+        self.state = np.zeros((rows, cols), dtype=np.int8)
+        self.adjacent = np.zeros((rows, cols), dtype=np.int8)
+        self.observation = np.full((rows, cols), -1, dtype=np.int8)
         self.game_over = False
         self.first_move = True
         self.revealed_count = 0
-        
+    
+    def reset(self):
+        """Clear the board for a new game, reusing the existing arrays"""
+        self.is_mine.fill(False)
+        self.state.fill(HIDDEN)
+        self.adjacent.fill(0)
+        self.observation.fill(-1)
+        self.game_over = False
+        self.first_move = True
+        self.revealed_count = 0
+    
     def place_mines(self, first_row: int, first_col: int):
         """Place mines randomly, avoiding the first clicked cell"""
-        positions = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if row != first_row or col != first_col:
-                    positions.append((row, col))
-        
-        mine_positions = random.sample(positions, self.num_mines)
+        # Sample from the flat index space without the first cell, then shift
+        # indices at or past it up by one to skip over it
+        first_index = first_row * self.cols + first_col
+        mine_indices = self.rng.choice(self.rows * self.cols - 1, self.num_mines, replace=False)
+        mine_indices += mine_indices >= first_index
         
-        for row, col in mine_positions:
-            self.board[row][col].is_mine = True
+        self.is_mine.flat[mine_indices] = True
         
         # Calculate adjacent mine counts
         self._calculate_adjacent_mines()
     
     def _calculate_adjacent_mines(self):
-        """Calculate the number of adjacent mines for each cell"""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if not self.board[row][col].is_mine:
-                    count = 0
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0:
-                                continue
-                            new_row, new_col = row + dr, col + dc
-                            if (0 <= new_row < self.rows and 
-                                0 <= new_col < self.cols and 
-                                self.board[new_row][new_col].is_mine):
-                                count += 1
-                    self.board[row][col].adjacent_mines = count
+        """Calculate the number of adjacent mines for each cell
+        
+        Sums the eight shifted copies of a zero-padded mine mask, which is a
+        3x3 convolution with the centre excluded.
+        """
+        padded = np.pad(self.is_mine.astype(np.int8), 1)
+        counts = self.adjacent
+        counts.fill(0)
+        for dr in range(3):
+            for dc in range(3):
+                if dr == 1 and dc == 1:
+                    continue
+                counts += padded[dr:dr + self.rows, dc:dc + self.cols]
+        counts[self.is_mine] = 0
     
     def get_adjacent_cells(self, row: int, col: int) -> List[Tuple[int, int]]:
         """Get all adjacent cell positions"""
         adjacent = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                new_row, new_col = row + dr, col + dc
-                if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
-                    adjacent.append((new_row, new_col))
+        for dr, dc in NEIGHBOR_OFFSETS:
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
+                adjacent.append((new_row, new_col))
         return adjacent
     
     def reveal_cell(self, row: int, col: int) -> bool:
@@ -116,70 +173,101 @@ class Board:
         if self.game_over or not (0 <= row < self.rows and 0 <= col < self.cols):
             return False
         
-        cell = self.board[row][col]
-        
         # Place mines on first move
         if self.first_move:
             self.place_mines(row, col)
             self.first_move = False
         
-        # Handle flagged cells
-        if cell.state == CellState.FLAGGED:
+        # Flagged and already revealed cells are left untouched
+        if self.state[row, col] != HIDDEN:
             return False
         
         # Reveal the cell
-        if cell.reveal():
+        self.state[row, col] = REVEALED
+        self.observation[row, col] = self.adjacent[row, col]
+        if self.is_mine[row, col]:
             self.game_over = True
             return True
         
         self.revealed_count += 1
         
         # If cell has no adjacent mines, reveal adjacent cells using BFS
-        if cell.adjacent_mines == 0:
+        if self.adjacent[row, col] == 0:
             self._reveal_adjacent_cells_bfs(row, col)
         
         return False
     
     def _reveal_adjacent_cells_bfs(self, start_row: int, start_col: int):
         """Reveal adjacent cells using BFS instead of recursion"""
-        queue = deque([(start_row, start_col)])
-        visited = set()
+        if HAS_NUMBA:
+            self.revealed_count += _bfs_reveal(self.state, self.adjacent, self.observation,
+                                               start_row, start_col, self.rows, self.cols)
+            return
+        
+        rows, cols = self.rows, self.cols
+        state, adjacent, observation = self.state, self.adjacent, self.observation
+        # Cells are queued as flat indices (row * cols + col). Each cell is queued
+        # at most once, on its hidden -> revealed transition, so rows * cols slots suffice.
+        queue = [0] * (rows * cols)
+        queue[0] = start_row * cols + start_col
+        head = 0
+        tail = 1
+        visited = bytearray(rows * cols)
         
-        while queue:
-            row, col = queue.popleft()
+        while head < tail:
+            index = queue[head]
+            head += 1
             
-            if (row, col) in visited:
+            if visited[index]:
                 continue
-            visited.add((row, col))
+            visited[index] = 1
+            row, col = divmod(index, cols)
             
             # Reveal all adjacent cells
-            for adj_row, adj_col in self.get_adjacent_cells(row, col):
-                adj_cell = self.board[adj_row][adj_col]
-                
-                if adj_cell.state == CellState.HIDDEN:
-                    adj_cell.reveal()
+            for dr, dc in NEIGHBOR_OFFSETS:
+                adj_row = row + dr
+                adj_col = col + dc
+                if not (0 <= adj_row < rows and 0 <= adj_col < cols):
+                    continue
+                if state[adj_row, adj_col] == HIDDEN:
+                    state[adj_row, adj_col] = REVEALED
+                    observation[adj_row, adj_col] = adjacent[adj_row, adj_col]
                     self.revealed_count += 1
                     
                     # If this cell also has no adjacent mines, add to queue
-                    if adj_cell.adjacent_mines == 0:
-                        queue.append((adj_row, adj_col))
+                    if adjacent[adj_row, adj_col] == 0:
+                        queue[tail] = adj_row * cols + adj_col
+                        tail += 1
     
     def flag_cell(self, row: int, col: int) -> bool:
-        """Flag or unflag a cell"""
+        """Flag or unflag a cell. Returns True if flagged, False if unflagged"""
         if self.game_over or not (0 <= row < self.rows and 0 <= col < self.cols):
             return False
         
-        cell = self.board[row][col]
-        return cell.toggle_flag()
+        current = self.state[row, col]
+        if current == REVEALED:
+            return False
+        
+        if current == HIDDEN:
+            self.state[row, col] = FLAGGED
+            self.observation[row, col] = -2
+            return True
+        else:
+            self.state[row, col] = HIDDEN
+            self.observation[row, col] = -1
+            return False
     
     def is_won(self) -> bool:
         """Check if the game is won"""
         return self.revealed_count == (self.rows * self.cols - self.num_mines)
     
     def get_cell(self, row: int, col: int) -> Optional[Cell]:
-        """Get a cell at the specified position"""
+        """Get a view of the cell at the specified position"""
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            return self.board[row][col]
+            return Cell(row, col,
+                        bool(self.is_mine[row, col]),
+                        _CELL_STATES[self.state[row, col]],
+                        int(self.adjacent[row, col]))
         return None
     
     def display(self, show_mines: bool = False):
@@ -194,7 +282,7 @@ class Board:
         for row in range(self.rows):
             print(f"{row:2} ", end="")
             for col in range(self.cols):
-                cell = self.board[row][col]
+                cell = self.get_cell(row, col)
                 if show_mines and cell.is_mine and cell.state != CellState.REVEALED:
                     print("💣 ", end="")
                 else:
@@ -205,28 +293,32 @@ class Board:
 class MinesweeperGame:
     """Main game controller class with Gym-style interface for ML"""
     
-    def __init__(self, rows: int = 9, cols: int = 9, num_mines: int = 10):
-        self.board = Board(rows, cols, num_mines)
+    def __init__(self, rows: int = 9, cols: int = 9, num_mines: int = 10,
+                 seed: Optional[Union[int, np.random.Generator]] = None):
+        self.board = Board(rows, cols, num_mines, seed)
         self.game_over = False
         self.won = False
         self.move_count = 0
     
-    def reset(self) -> dict:
-        """Reset the game to initial state (Gym-style interface)"""
-        self.board = Board(self.board.rows, self.board.cols, self.board.num_mines)
+    def reset(self) -> None:
+        """Reset the game to initial state (Gym-style interface)
+        
+        The board state is not built here; call get_game_state() if needed.
+        """
+        self.board.reset()
         self.game_over = False
         self.won = False
         self.move_count = 0
-        return self.get_game_state()
     
-    def step(self, action: Tuple[int, int, str]) -> Tuple[dict, float, bool, dict]:
+    def step(self, action: Tuple[int, int, str]) -> Tuple[None, float, bool, dict]:
         """Take a step in the game (Gym-style interface)
         
         Args:
             action: Tuple of (row, col, action_type) where action_type is "reveal" or "flag"
             
         Returns:
-            (state, reward, done, info)
+            (None, reward, done, info). The state slot is kept for Gym-style
+            unpacking; call get_game_state() explicitly to build it.
         """
         row, col, action_type = action
         
@@ -236,7 +328,7 @@ class MinesweeperGame:
                 self.game_over = True
                 reward = -10.0  # Penalty for hitting mine
             else:
-                reward = 1.0 if self.board.is_won() else 0.1  # Small reward for safe moves
+                reward = 0.1  # Small reward for safe moves
         elif action_type == "flag":
             self.board.flag_cell(row, col)
             reward = 0.0  # No immediate reward for flagging
@@ -245,7 +337,7 @@ class MinesweeperGame:
         
         self.move_count += 1
         
-        # Check for win
+        # Check for win (once per step; a winning reveal gets the win reward below)
         if self.board.is_won():
             self.won = True
             reward = 10.0  # Large reward for winning
@@ -258,7 +350,7 @@ class MinesweeperGame:
             'game_over': self.game_over
         }
         
-        return self.get_game_state(), reward, done, info
+        return None, reward, done, info
     
     def make_move(self, row: int, col: int, action: str = "reveal") -> bool:
         """Legacy method for backward compatibility"""
@@ -283,7 +375,7 @@ class MinesweeperGame:
             for col in range(self.board.cols):
                 cell = self.board.get_cell(row, col)
                 cell_state = {
-                    'state': cell.state.value,
+                    'state': str(cell.state),
                     'is_mine': cell.is_mine,
                     'adjacent_mines': cell.adjacent_mines,
                     'row': cell.row,
@@ -1,6 +1,6 @@
 import numpy as np
-from minesweeper import MinesweeperGame, CellState
-from typing import Tuple, Dict, Any
+from minesweeper import MinesweeperGame
+from typing import Tuple, Dict, Any, Callable, Hashable, Optional, Union
 
 class MinesweeperEnv:
     """
@@ -17,7 +17,8 @@ class MinesweeperEnv:
     - Transition: The change in observation after an action is taken.
     """
 
-    def __init__(self, rows: int = 9, cols: int = 9, num_mines: int = 10, discount_factor: float = 0.95):
+    def __init__(self, rows: int = 9, cols: int = 9, num_mines: int = 10, discount_factor: float = 0.95,
+                 seed: Optional[Union[int, np.random.Generator]] = None):
         """
         Initialize the Minesweeper environment.
         
@@ -26,8 +27,10 @@ class MinesweeperEnv:
             cols (int): The number of columns on the board.
             num_mines (int): The number of mines on the board.
             discount_factor (float): The discount factor (gamma) for future rewards.
+            seed (int or np.random.Generator, optional): Seed for mine placement,
+                or a Generator to share with the agent.
         """
-        self.game = MinesweeperGame(rows, cols, num_mines)
+        self.game = MinesweeperGame(rows, cols, num_mines, seed)
         self.discount_factor = discount_factor
         
         # Action space: (rows * cols * 2)
@@ -43,22 +46,16 @@ class MinesweeperEnv:
 
     def _get_observation(self) -> np.ndarray:
         """
-        Generate the numerical observation matrix from the current game state.
+        Get the numerical observation matrix for the current game state.
+        
+        The board keeps the observation up to date as cells change, so this
+        only copies it; the copy keeps earlier observations held by the agent
+        from changing under it.
         
         Returns:
             np.ndarray: A (rows x cols) NumPy array representing the board.
         """
-        observation = np.full(self.observation_shape, -1, dtype=int)
-        for r in range(self.game.board.rows):
-            for c in range(self.game.board.cols):
-                cell = self.game.board.get_cell(r, c)
-                if cell.state == CellState.REVEALED:
-                    observation[r, c] = cell.adjacent_mines
-                elif cell.state == CellState.FLAGGED:
-                    observation[r, c] = -2
-                else: # Hidden
-                    observation[r, c] = -1
-        return observation
+        return self.game.board.observation.copy()
 
     def _action_to_tuple(self, action: int) -> Tuple[int, int, str]:
         """
@@ -112,22 +109,51 @@ class MinesweeperEnv:
                 - done (bool): Whether the episode has ended.
                 - info (Dict): Contains auxiliary diagnostic information.
         """
+        reward, done, info = self._apply_action(action)
+        observation = self._get_observation()
+        
+        return observation, reward, done, info
+
+    def step_keyed(self, action: int, state_to_key: Callable[[np.ndarray], Hashable]) -> Tuple[Hashable, float, bool, Dict[str, Any]]:
+        """
+        Execute one time step and return a key of the new observation instead of a copy of it.
+        
+        Args:
+            action (int): An action provided by the agent.
+            state_to_key (Callable): Maps an observation to a hashable key, e.g.
+                QLearningAgent.state_to_key. It is given the live observation
+                (see the observation property) and must not keep a reference to it.
+            
+        Returns:
+            Tuple[Hashable, float, bool, Dict[str, Any]]: (state_key, reward, done, info)
+        """
+        reward, done, info = self._apply_action(action)
+        return state_to_key(self.game.board.observation), reward, done, info
+
+    @property
+    def observation(self) -> np.ndarray:
+        """
+        The live observation array, updated in place as the game advances.
+        Read it without modifying it; use _get_observation() for a snapshot.
+        """
+        return self.game.board.observation
+
+    def _apply_action(self, action: int) -> Tuple[float, bool, Dict[str, Any]]:
+        """
+        Apply an action to the game without materializing the observation.
+        """
         try:
             action_tuple = self._action_to_tuple(action)
         except ValueError as e:
             # Handle invalid action gracefully
-            observation = self._get_observation()
             reward = -1.0 # Penalty for invalid action
             done = self.game.game_over or self.game.won
             info = {'error': str(e)}
-            return observation, reward, done, info
+            return reward, done, info
 
         # The game's step method already returns the reward and done status
         _, reward, done, info = self.game.step(action_tuple)
-        
-        observation = self._get_observation()
-        
-        return observation, reward, done, info
+        return reward, done, info
 
     def render(self):
         """
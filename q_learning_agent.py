@@ -1,67 +1,139 @@
 import numpy as np
-import pickle
-from typing import Any, Tuple, Optional
+from typing import Any, List, Tuple, Optional, Union
 
 class QLearningAgent:
     """
     Q-Learning agent for MinesweeperEnv.
     Maintains a Q-table and supports epsilon-greedy exploration.
     """
-    def __init__(self, action_space_size: int, alpha: float = 0.1, gamma: float = 0.99, epsilon: float = 0.1):
-        self.Q = {}  # Q-table: dict mapping (state_key, action) -> value
+    def __init__(self, action_space_size: int, alpha: float = 0.1, gamma: float = 0.99, epsilon: float = 0.1,
+                 seed: Optional[Union[int, np.random.Generator]] = None):
+        self.Q = {}  # Q-table: dict mapping state_key -> array of Q-values per action
         self.alpha = alpha  # Learning rate
         self.gamma = gamma  # Discount factor
         self.epsilon = epsilon  # Exploration rate
         self.action_space_size = action_space_size
+        self.rng = np.random.default_rng(seed)  # A Generator passed as seed is used as-is
 
-    def _state_to_key(self, state: np.ndarray) -> Any:
+    def state_to_key(self, state: np.ndarray) -> Any:
         """
         Convert a state (observation) to a hashable key for the Q-table.
-        Uses the flattened tuple of the state array.
+        Uses the raw bytes of the int8 state array.
         """
-        return tuple(state.flatten())
+        return state.astype(np.int8, copy=False).tobytes()
+
+    def _q_values(self, state_key: Any) -> np.ndarray:
+        """
+        Get the Q-value array for a state, creating a zeroed one if unseen.
+        """
+        q_values = self.Q.get(state_key)
+        if q_values is None:
+            q_values = np.zeros(self.action_space_size, dtype=np.float32)
+            self.Q[state_key] = q_values
+        return q_values
+
+    def valid_mask(self, state: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask over the action space of actions that change the board.
+        Reveals are valid on hidden cells; flag toggles on hidden or flagged cells.
+        """
+        cells = state.ravel()
+        return np.concatenate((cells == -1, cells < 0))
 
     def choose_action(self, state: np.ndarray) -> int:
         """
-        Choose an action using epsilon-greedy policy.
+        Choose an action using epsilon-greedy policy over the valid actions.
         """
-        state_key = self._state_to_key(state)
-        if np.random.rand() < self.epsilon:
-            # Explore: random action
-            return np.random.randint(0, self.action_space_size)
+        return self.choose_action_keyed(self.state_to_key(state), self.valid_mask(state))
+
+    def choose_action_keyed(self, state_key: Any, mask: np.ndarray) -> int:
+        """
+        Same as choose_action, for a state already converted by state_to_key and valid_mask.
+        """
+        q_values = self.Q.get(state_key)
+        if q_values is None or self.rng.random() < self.epsilon:
+            # Explore: random valid action (an unseen state has all-zero Q-values)
+            return int(self.rng.choice(np.flatnonzero(mask)))
         else:
-            # Exploit: best known action
-            q_values = [self.Q.get((state_key, a), 0.0) for a in range(self.action_space_size)]
-            max_q = max(q_values)
+            # Exploit: best known valid action
+            valid_qs = np.where(mask, q_values, -np.inf)
             # Break ties randomly
-            best_actions = [a for a, q in enumerate(q_values) if q == max_q]
-            return np.random.choice(best_actions)
+            best_actions = np.flatnonzero(valid_qs == valid_qs.max())
+            return int(self.rng.choice(best_actions))
 
     def update(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray, done: bool):
         """
         Update the Q-table using the Q-learning update rule.
         """
-        state_key = self._state_to_key(state)
-        next_state_key = self._state_to_key(next_state)
-        old_q = self.Q.get((state_key, action), 0.0)
-        if done:
-            target = reward
-        else:
-            next_qs = [self.Q.get((next_state_key, a), 0.0) for a in range(self.action_space_size)]
-            target = reward + self.gamma * max(next_qs)
-        new_q = (1 - self.alpha) * old_q + self.alpha * target
-        self.Q[(state_key, action)] = new_q
+        self.update_keyed(self.state_to_key(state), action, reward,
+                          self.state_to_key(next_state), self.valid_mask(next_state), done)
+
+    def update_keyed(self, state_key: Any, action: int, reward: float, next_state_key: Any,
+                     next_mask: np.ndarray, done: bool):
+        """
+        Same as update, for states already converted by state_to_key and valid_mask.
+        """
+        target = reward
+        if not done:
+            target += self.gamma * self._max_next_q(next_state_key, next_mask)
+        self._apply_update(state_key, action, target)
+
+    def update_batch(self, transitions: List[Tuple[Any, int, float, Any, np.ndarray, bool]]):
+        """
+        Apply update_keyed to a batch of
+        (state_key, action, reward, next_state_key, next_mask, done) transitions.
+        The best next-state value is looked up once per distinct next state,
+        from the Q-table as it was before the batch.
+        """
+        max_next_qs = {}
+        for _, _, _, next_state_key, next_mask, done in transitions:
+            if not done and next_state_key not in max_next_qs:
+                max_next_qs[next_state_key] = self._max_next_q(next_state_key, next_mask)
+
+        for state_key, action, reward, next_state_key, _, done in transitions:
+            target = reward if done else reward + self.gamma * max_next_qs[next_state_key]
+            self._apply_update(state_key, action, target)
+
+    def _apply_update(self, state_key: Any, action: int, target: float):
+        """
+        Move the Q-value of (state, action) towards target by the learning rate.
+        """
+        q_values = self._q_values(state_key)
+        q_values[action] = (1 - self.alpha) * q_values[action] + self.alpha * target
+
+    def _max_next_q(self, next_state_key: Any, next_mask: np.ndarray) -> float:
+        """
+        Best Q-value over the valid actions of a state, 0.0 if it is unseen.
+        """
+        next_qs = self.Q.get(next_state_key)
+        if next_qs is None or not next_mask.any():
+            return 0.0
+        return next_qs[next_mask].max()
 
     def save(self, filename: str):
         """
-        Save the Q-table to a file.
+        Save the Q-table to a compressed .npz file as two parallel arrays:
+        keys (uint8, the bytes of each state key, one row per state)
+        and values (float32, one row of Q-values per state).
         """
-        with open(filename, 'wb') as f:
-            pickle.dump(self.Q, f)
+        if self.Q:
+            keys = np.stack([np.frombuffer(key, dtype=np.uint8) for key in self.Q])
+        else:
+            keys = np.zeros((0, 0), dtype=np.uint8)
+        values = np.array(list(self.Q.values()), dtype=np.float32).reshape(-1, self.action_space_size)
+        np.savez_compressed(filename, keys=keys, values=values)
 
     def load(self, filename: str):
         """
-        Load the Q-table from a file.
+        Load a Q-table saved by save().
+        Raises ValueError if it was saved for a different action space size.
         """
-        with open(filename, 'rb') as f:
-            self.Q = pickle.load(f) 
\ No newline at end of file
+        with np.load(filename) as data:
+            keys = data['keys']
+            values = data['values']
+        if values.shape[1] != self.action_space_size:
+            raise ValueError(f"Q-table values have {values.shape[1]} actions, "
+                             f"expected action space size {self.action_space_size}")
+        if len(keys) != len(values):
+            raise ValueError(f"Q-table has {len(keys)} keys but {len(values)} rows of values")
+        self.Q = {bytes(row): q_values for row, q_values in zip(keys, values)}
@@ -4,12 +4,14 @@ from q_learning_agent import QLearningAgent
 
 EPISODES = 5000
 MAX_STEPS = 200
-SAVE_PATH = 'q_table.pkl'
+SAVE_PATH = 'q_table.npz'
 
 # Hyperparameters
 ALPHA = 0.1
 GAMMA = 0.99
 EPSILON = 0.1
+SEED = None  # Set to an int for reproducible runs
+BATCH_SIZE = 256  # Transitions buffered per Q-table update
 
 # Environment parameters
 ROWS = 5
@@ -17,29 +19,39 @@ COLS = 5
 MINES = 3
 
 def train():
-    env = MinesweeperEnv(rows=ROWS, cols=COLS, num_mines=MINES)
+    # One generator drives both mine placement and the agent's exploration
+    rng = np.random.default_rng(SEED)
+    env = MinesweeperEnv(rows=ROWS, cols=COLS, num_mines=MINES, seed=rng)
     agent = QLearningAgent(
         action_space_size=env.action_space_size,
         alpha=ALPHA,
         gamma=GAMMA,
-        epsilon=EPSILON
+        epsilon=EPSILON,
+        seed=rng
     )
 
     win_count = 0
     total_reward = 0.0
     reward_history = []
+    buffer = []
 
     for episode in range(1, EPISODES + 1):
         state = env.reset()
+        state_key = agent.state_to_key(state)
+        mask = agent.valid_mask(state)
         done = False
         episode_reward = 0.0
         steps = 0
 
         while not done and steps < MAX_STEPS:
-            action = agent.choose_action(state)
-            next_state, reward, done, info = env.step(action)
-            agent.update(state, action, reward, next_state, done)
-            state = next_state
+            action = agent.choose_action_keyed(state_key, mask)
+            next_state_key, reward, done, info = env.step_keyed(action, agent.state_to_key)
+            next_mask = agent.valid_mask(env.observation)
+            buffer.append((state_key, action, reward, next_state_key, next_mask, done))
+            if len(buffer) == BATCH_SIZE:
+                agent.update_batch(buffer)
+                buffer.clear()
+            state_key, mask = next_state_key, next_mask
             episode_reward += reward
             steps += 1
 
@@ -52,6 +64,9 @@ def train():
             avg_reward = np.mean(reward_history[-500:])
             print(f"Episode {episode}/{EPISODES} | Win rate: {win_count/episode:.2%} | Avg reward (last 500): {avg_reward:.2f}")
 
+    if buffer:
+        agent.update_batch(buffer)
+
     # Save Q-table
     agent.save(SAVE_PATH)
     print(f"\nTraining complete. Q-table saved to {SAVE_PATH}")